@@ -1,14 +1,16 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Request
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, HttpUrl
-from typing import List, Optional
+from typing import List, Optional, Set
 import logging
 import json
 import requests
 from .config import config
 from .models import Generator
-from .database import VectorDatabase
-from .document_processor import extract_from_url, extract_from_pdf, extract_from_image
+from .database import create_database
+from .document_processor import extract_from_url, extract_document, DocumentTooLargeError, UnsupportedFormatError
 
 # Initialize logging
 logging.basicConfig(
@@ -18,11 +20,53 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Initialize components
-db = VectorDatabase()
+db = create_database()
 generator = Generator()
 
 app = FastAPI(title="RAG Backend API")
 
+class UploadSizeLimitMiddleware:
+    """
+    Enforce a request body size limit on upload routes as the body arrives
+
+    Starlette spools multipart files to disk as they are parsed, so counting
+    received bytes bounds memory and disk use, including for chunked
+    requests that send no Content-Length.
+    """
+
+    def __init__(self, app, max_size: int, paths: Set[str]):
+        self.app = app
+        self.max_size = max_size
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Upload exceeds {self.max_size} bytes"
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > self.max_size:
+            response = JSONResponse(status_code=413, content={"detail": detail})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    # Raised from inside body parsing; FastAPI returns it as the response
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+app.add_middleware(UploadSizeLimitMiddleware, max_size=config.MAX_UPLOAD_SIZE, paths={"/upload/"})
+
 # Setup CORS
 app.add_middleware(
     CORSMiddleware,
@@ -56,6 +100,8 @@ async def startup_event():
     try:
         db.connect()
         generator.init_rag_chain(db.get_retriever())
+        # Rebind the RAG chain whenever a rebuilt collection is swapped in
+        db.add_swap_listener(lambda: generator.init_rag_chain(db.get_retriever()))
         logger.info("Application startup completed")
     except Exception as e:
         logger.error(f"Startup failed: {str(e)}")
@@ -66,16 +112,30 @@ async def shutdown_event():
     db.disconnect()
 
 # Helper Functions
+# Database writes are run in the threadpool: they wait on the write lock while
+# a bulk import copies and swaps collections, and must not block queries
 def process_content(content: str, source: str) -> int:
     return db.process_content(content, source)
 
+def rebuild_index() -> None:
+    try:
+        db.rebuild_index()
+    except Exception as e:
+        logger.error(f"Index rebuild failed: {str(e)}", exc_info=True)
+
+def migrate_collection() -> None:
+    try:
+        db.migrate_legacy_collection()
+    except Exception as e:
+        logger.error(f"Collection migration failed: {str(e)}", exc_info=True)
+
 # API Endpoints
 @app.post("/process_url/")
 async def process_url(request: UrlRequest) -> DocumentResponse:
     try:
         logger.info(f"Processing URL: {request.url}")
         content = extract_from_url(str(request.url))
-        chunks = process_content(content, f"url:{request.url}")
+        chunks = await run_in_threadpool(process_content, content, f"url:{request.url}")
         
         return DocumentResponse(
             status="success",
@@ -92,14 +152,11 @@ async def upload_file(file: UploadFile = File(...)) -> DocumentResponse:
     try:
         logger.info(f"Processing file: {file.filename}")
         
-        if file.filename.lower().endswith('.pdf'):
-            content = extract_from_pdf(file.file)
-            source_type = "pdf"
-        else:
-            content = extract_from_image(file.file)
-            source_type = "image"
+        # Starlette has already spooled the upload to disk within the size limit.
+        # Extraction (OCR especially) is CPU-bound, so keep it off the event loop
+        source_type, content = await run_in_threadpool(extract_document, file.file, file.filename or "")
         
-        chunks = process_content(content, f"{source_type}:{file.filename}")
+        chunks = await run_in_threadpool(process_content, content, f"{source_type}:{file.filename}")
         
         return DocumentResponse(
             status="success",
@@ -107,10 +164,61 @@ async def upload_file(file: UploadFile = File(...)) -> DocumentResponse:
             document_id=file.filename,
             chunks=chunks
         )
+    except HTTPException:
+        raise
+    except DocumentTooLargeError as e:
+        logger.error(f"File upload rejected: {str(e)}")
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedFormatError as e:
+        logger.error(f"File upload rejected: {str(e)}")
+        raise HTTPException(status_code=415, detail=str(e))
     except Exception as e:
         logger.error(f"File upload failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.delete("/documents/{source:path}")
+async def delete_document(source: str) -> DocumentResponse:
+    try:
+        logger.info(f"Deleting source: {source}")
+        chunks = await run_in_threadpool(db.delete_by_source, source)
+    except Exception as e:
+        logger.error(f"Delete failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if not chunks:
+        raise HTTPException(status_code=404, detail=f"No chunks stored for source: {source}")
+
+    return DocumentResponse(
+        status="success",
+        message="Document deleted successfully",
+        document_id=source,
+        chunks=chunks
+    )
+
+@app.post("/index/rebuild/", status_code=202)
+async def rebuild(background_tasks: BackgroundTasks):
+    if db.is_index_operation_running():
+        raise HTTPException(status_code=409, detail="An index operation is already running")
+
+    background_tasks.add_task(rebuild_index)
+    return {"status": "accepted", "message": "Index rebuild started"}
+
+@app.post("/index/migrate/", status_code=202)
+async def migrate(background_tasks: BackgroundTasks):
+    if db.is_index_operation_running():
+        raise HTTPException(status_code=409, detail="An index operation is already running")
+
+    background_tasks.add_task(migrate_collection)
+    return {"status": "accepted", "message": "Legacy collection migration started"}
+
+@app.get("/stats")
+async def stats():
+    try:
+        return db.stats()
+    except Exception as e:
+        logger.error(f"Stats failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/query/")
 async def process_query(request: Request):
     try:
@@ -0,0 +1,202 @@
+"""
+Per-format extraction throughput benchmark
+
+Runs extract_document (sniffing + extraction) over synthetic documents of
+every registered format, or over real files grouped by sniffed format.
+
+    python -m backend.benchmark
+    python -m backend.benchmark --samples ./archive --repeat 3
+"""
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+import argparse
+import logging
+import os
+import sys
+import time
+import zipfile
+from .document_processor import extract_document, sniff_format, EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+LOREM = (
+    "Retrieval augmented generation combines a vector index with a language model. "
+    "Documents are split into overlapping chunks, embedded and stored for search. "
+)
+
+def _paragraphs(size: int) -> List[str]:
+    count = max(1, size // len(LOREM))
+    return [f"{i}. {LOREM}" for i in range(count)]
+
+def make_text(size: int) -> bytes:
+    return "\n\n".join(_paragraphs(size)).encode("utf-8")
+
+def make_markdown(size: int) -> bytes:
+    body = "\n\n".join(f"## Section {i}\n\n{p}" for i, p in enumerate(_paragraphs(size)))
+    return f"# Benchmark\n\n{body}".encode("utf-8")
+
+def make_html(size: int) -> bytes:
+    body = "".join(f"<p>{p}</p>" for p in _paragraphs(size))
+    return (
+        "<!DOCTYPE html><html><head><style>p {}</style><script>var x = 1;</script></head>"
+        f"<body><nav>Home</nav>{body}<footer>Footer</footer></body></html>"
+    ).encode("utf-8")
+
+def make_docx(size: int) -> bytes:
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = "".join(f"<w:p><w:r><w:t>{p}</w:t></w:r></w:p>" for p in _paragraphs(size))
+    stream = BytesIO()
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml", '<?xml version="1.0"?><Types/>')
+        docx.writestr("word/document.xml", f'<w:document xmlns:w="{ns}"><w:body>{body}</w:body></w:document>')
+    return stream.getvalue()
+
+def make_pdf(size: int) -> bytes:
+    """Minimal single-font PDF with one text line per paragraph, 40 lines per page"""
+    lines = [p.replace("\\", "").replace("(", "").replace(")", "") for p in _paragraphs(size)]
+    pages = [lines[i:i + 40] for i in range(0, len(lines), 40)]
+    font_id = 3 + 2 * len(pages)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            " ".join(f"{3 + 2 * i} 0 R" for i in range(len(pages))), len(pages))).encode(),
+    ]
+    for i, page in enumerate(pages):
+        text = "".join(f"({line[:90]}) Tj T* " for line in page)
+        stream = f"BT /F1 9 Tf 12 TL 36 800 Td {text}ET".encode("latin-1")
+        objects.append((
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>"
+        ).encode())
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+def _render_pages(size: int, pages: int):
+    from PIL import Image, ImageDraw
+
+    lines = _paragraphs(size)
+    per_page = max(1, len(lines) // pages)
+    images = []
+    for i in range(pages):
+        img = Image.new("L", (1240, 1754), 255)
+        draw = ImageDraw.Draw(img)
+        for row, line in enumerate(lines[i * per_page:(i + 1) * per_page][:80]):
+            draw.text((40, 40 + row * 20), line[:110], fill=0)
+        images.append(img)
+    return images
+
+def make_image(size: int) -> bytes:
+    stream = BytesIO()
+    _render_pages(size, 1)[0].save(stream, format="PNG")
+    return stream.getvalue()
+
+def make_tiff(size: int) -> bytes:
+    first, *rest = _render_pages(size, 3)
+    stream = BytesIO()
+    first.save(stream, format="TIFF", save_all=True, append_images=rest)
+    return stream.getvalue()
+
+GENERATORS = {
+    "text": (make_text, "sample.txt"),
+    "markdown": (make_markdown, "sample.md"),
+    "html": (make_html, "sample.html"),
+    "docx": (make_docx, "sample.docx"),
+    "pdf": (make_pdf, "sample.pdf"),
+    "image": (make_image, "sample.png"),
+    "tiff": (make_tiff, "sample.tiff"),
+}
+
+def synthetic_samples(size: int) -> Dict[str, List[Tuple[str, bytes]]]:
+    samples: Dict[str, List[Tuple[str, bytes]]] = {}
+    for fmt, (generate, filename) in GENERATORS.items():
+        try:
+            samples[fmt] = [(filename, generate(size))]
+        except Exception as e:
+            logger.warning(f"Could not generate {fmt} sample: {str(e)}")
+    return samples
+
+def directory_samples(root: str) -> Dict[str, List[Tuple[str, bytes]]]:
+    """Load files under root, grouped by sniffed format"""
+    samples: Dict[str, List[Tuple[str, bytes]]] = {}
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(dirpath, name)
+            if os.path.splitext(name)[1].lower() not in EXTENSIONS:
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            try:
+                fmt = sniff_format(BytesIO(data), name)
+            except ValueError:
+                continue
+            samples.setdefault(fmt, []).append((name, data))
+    return samples
+
+def run(samples: Dict[str, List[Tuple[str, bytes]]], repeat: int) -> List[Dict]:
+    results = []
+    for fmt, files in samples.items():
+        total_bytes = sum(len(data) for _, data in files) * repeat
+        chars = 0
+        error: Optional[str] = None
+        start = time.perf_counter()
+        try:
+            for _ in range(repeat):
+                for filename, data in files:
+                    _, text = extract_document(BytesIO(data), filename)
+                    chars += len(text)
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e)}"
+        elapsed = max(time.perf_counter() - start, 1e-9)
+
+        results.append({
+            "format": fmt,
+            "files": len(files) * repeat,
+            "mb": total_bytes / 1e6,
+            "seconds": elapsed,
+            "files_per_s": len(files) * repeat / elapsed,
+            "mb_per_s": total_bytes / 1e6 / elapsed,
+            "chars": chars,
+            "error": error,
+        })
+    return results
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark text extraction per format")
+    parser.add_argument("--samples", help="Directory of real documents to benchmark")
+    parser.add_argument("--size", type=int, default=200_000,
+                        help="Approximate text size of synthetic documents in characters")
+    parser.add_argument("--repeat", type=int, default=5, help="Passes over each sample")
+    args = parser.parse_args(argv)
+
+    # Per-document extraction logs would swamp the report
+    logging.getLogger("backend.document_processor").setLevel(logging.WARNING)
+
+    samples = directory_samples(args.samples) if args.samples else synthetic_samples(args.size)
+    results = run(samples, args.repeat)
+
+    print(f"{'format':<10}{'files':>7}{'MB':>9}{'sec':>9}{'files/s':>10}{'MB/s':>9}{'chars':>12}")
+    for r in results:
+        if r["error"]:
+            print(f"{r['format']:<10}  failed: {r['error']}")
+            continue
+        print(
+            f"{r['format']:<10}{r['files']:>7}{r['mb']:>9.2f}{r['seconds']:>9.3f}"
+            f"{r['files_per_s']:>10.2f}{r['mb_per_s']:>9.2f}{r['chars']:>12}"
+        )
+    return 1 if any(r["error"] for r in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,11 @@ class Config:
         self.MILVUS_HOST = self._get_env_var("MILVUS_HOST", "localhost")
         self.MILVUS_PORT = self._get_env_var("MILVUS_PORT", "19530")
         self.COLLECTION_NAME = os.getenv("COLLECTION_NAME", "rag_docs")
+        self.MILVUS_CONSISTENCY_LEVEL = os.getenv("MILVUS_CONSISTENCY_LEVEL", "Session")
+        self.BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", 1000))
+        self.VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "milvus").lower()
+        self.LOCAL_VECTOR_PATH = os.getenv("LOCAL_VECTOR_PATH", str(Path(__file__).parent.parent / "local_vectors.jsonl"))
+        self.MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE_MB", 50)) * 1024 * 1024
         self.EMBEDDING_MODEL = "all-MiniLM-L6-v2"
         self.MAX_TOKENS = int(os.getenv("MAX_TOKENS", 200))
         self.EMBEDDING_DIM = 384
@@ -2,13 +2,25 @@ from pymilvus import connections, utility, Collection, CollectionSchema, FieldSc
 from langchain_community.vectorstores import Milvus
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from sentence_transformers import SentenceTransformer
-from typing import Optional, List
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Optional, List, Set, Tuple
 import logging
+import math
+import threading
+import time
+import uuid
 import numpy as np
 from .config import config
+from .local_store import LocalVectorStore
 
 logger = logging.getLogger(__name__)
 
+# IVF_FLAT sizing bounds: nlist grows with ~4*sqrt(rows), nprobe with nlist/16
+MIN_NLIST = 128
+MAX_NLIST = 65536
+MIN_NPROBE = 10
+MAX_NPROBE = 256
+
 class EmbeddingWrapper:
     def __init__(self, model):
         self.model = model
@@ -22,14 +34,115 @@ class EmbeddingWrapper:
         """Embed a single query"""
         return self.model.encode(text).tolist()
 
+class BulkImport:
+    """
+    Write handle returned by VectorDatabase.bulk_import()
+
+    Only writes made through this handle go to the unindexed staging
+    collection. Primary keys are kept per source so that deletes made while
+    the import runs can be replayed exactly once the collection is loaded.
+    Sources written or deleted in the serving collection meanwhile are
+    recorded, so they can be copied again after the bulk copy.
+    """
+
+    def __init__(self, db: "VectorDatabase", collection: Collection):
+        self.db = db
+        self.collection = collection
+        self.pk_field = next(field.name for field in collection.schema.fields if field.is_primary)
+        self._lock = threading.Lock()
+        self._staged: Dict[str, List[int]] = {}
+        self._pending_deletes: List[int] = []
+        self._touched: Set[str] = set()
+        self._closed = False
+
+    def process_content(self, content: str, source: str) -> int:
+        """Chunk, embed and stage one document"""
+        return self.process_contents([(content, source)])[0]
+
+    def process_contents(self, documents: List[Tuple[str, str]]) -> List[int]:
+        """Chunk, embed and stage several (content, source) pairs"""
+        texts, metadatas, counts = self.db._split_documents(documents)
+        if not texts:
+            return counts
+
+        embeddings = self.db.embedding_wrapper.embed_documents(texts)
+        rows = [
+            {"text": text, "vector": embedding, **metadata}
+            for text, embedding, metadata in zip(texts, embeddings, metadatas)
+        ]
+        batch_size = config.BULK_INSERT_BATCH_SIZE
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Bulk import has already finished")
+            for i in range(0, len(rows), batch_size):
+                result = self.collection.insert(rows[i:i + batch_size])
+                for metadata, pk in zip(metadatas[i:i + batch_size], result.primary_keys):
+                    self._staged.setdefault(metadata["source"], []).append(pk)
+
+        logger.info(f"Staged {len(texts)} chunks from {len(documents)} sources")
+        return counts
+
+    def discard_source(self, source: str) -> int:
+        """Schedule removal of the chunks staged so far for a source"""
+        with self._lock:
+            pks = self._staged.pop(source, [])
+            self._pending_deletes.extend(pks)
+            return len(pks)
+
+    def touch(self, sources: Iterable[str]) -> None:
+        """Record sources written or deleted in the serving collection during the import"""
+        with self._lock:
+            self._touched.update(sources)
+
+    def take_touched(self) -> Set[str]:
+        """Return and forget the sources recorded by touch()"""
+        with self._lock:
+            touched, self._touched = self._touched, set()
+            return touched
+
+    def staged_keys(self, source: str) -> List[int]:
+        """Primary keys of the chunks currently staged for a source"""
+        with self._lock:
+            return list(self._staged.get(source, []))
+
+    def staged_rows(self) -> int:
+        """Number of staged chunks not scheduled for deletion"""
+        with self._lock:
+            return sum(len(pks) for pks in self._staged.values())
+
+    def close(self) -> None:
+        """Reject further writes through this handle"""
+        with self._lock:
+            self._closed = True
+
+    def replay_deletes(self) -> None:
+        """Apply deletes recorded during the import (the collection must be loaded)"""
+        with self._lock:
+            pks, self._pending_deletes = self._pending_deletes, []
+        batch_size = config.BULK_INSERT_BATCH_SIZE
+        for i in range(0, len(pks), batch_size):
+            self.collection.delete(f"{self.pk_field} in {pks[i:i + batch_size]}")
+
 class VectorDatabase:
     def __init__(self):
         self.host = config.MILVUS_HOST
         self.port = config.MILVUS_PORT
+        # Serving name: a Milvus alias that queries and writes always go through
         self.collection_name = config.COLLECTION_NAME
+        # Physical collection currently behind the alias (informational)
+        self.active_collection: Optional[str] = None
         self.embedding_model = SentenceTransformer(config.EMBEDDING_MODEL)
         self.embedding_wrapper = EmbeddingWrapper(self.embedding_model)
         self.vector_store: Optional[Milvus] = None
+        self.search_params = self._search_params(MIN_NLIST)
+
+        # Index lifecycle state
+        self._lifecycle_lock = threading.Lock()
+        # Held by live writes/deletes, and by bulk_import for its final catch-up and swap
+        self._write_lock = threading.Lock()
+        self._import: Optional[BulkImport] = None
+        self._swap_listeners: List[Callable[[], None]] = []
+        self.index_status: Dict[str, Any] = {"state": "idle", "error": None, "last_build": None}
         
         # Configure text splitter
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -55,25 +168,18 @@ class VectorDatabase:
                 port=self.port
             )
             
-            # Initialize vector store with proper schema
-            self.vector_store = Milvus(
-                embedding_function=self.embedding_wrapper,
-                collection_name=self.collection_name,
-                connection_args={
-                    "host": self.host,
-                    "port": self.port
-                },
-                consistency_level="Strong",
-                auto_id=True,
-                index_params={
-                    "index_type": "IVF_FLAT",
-                    "metric_type": "L2",
-                    "params": {"nlist": 128}
-                },
-                search_params={"metric_type": "L2", "params": {"nprobe": 10}},
-                drop_old=False  # Important to keep existing data
-            )
-            logger.info(f"Connected to Milvus collection: {self.collection_name}")
+            self.active_collection = self._resolve_active_collection()
+            if self.active_collection is None:
+                self.active_collection = self._bootstrap_collection()
+            elif self._is_legacy():
+                logger.warning(
+                    f"{self.collection_name} is a collection, not an alias; "
+                    "run migrate_legacy_collection() before bulk imports or rebuilds"
+                )
+
+            index_params = self._current_index_params(Collection(self.active_collection)) or self._index_params(0)
+            self.vector_store = self._open_store(index_params)
+            logger.info(f"Connected to Milvus collection: {self.collection_name} -> {self.active_collection}")
             
         except Exception as e:
             logger.error(f"Connection failed: {str(e)}")
@@ -93,8 +199,7 @@ class VectorDatabase:
                         for i in range(len(chunks))]
             
             # Store chunks in vector database
-            if chunks:
-                self.vector_store.add_texts(texts=chunks, metadatas=metadatas)
+            self._store_chunks(chunks, metadatas)
             
             logger.info(f"Stored {len(chunks)} chunks from source: {source}")
             return len(chunks)
@@ -103,6 +208,19 @@ class VectorDatabase:
             logger.error(f"Content processing failed: {str(e)}")
             raise
 
+    def process_contents(self, documents: List[Tuple[str, str]]) -> List[int]:
+        """Process several (content, source) pairs with one embedding and insert pass"""
+        try:
+            texts, metadatas, counts = self._split_documents(documents)
+            self._store_chunks(texts, metadatas)
+
+            logger.info(f"Stored {len(texts)} chunks from {len(documents)} sources")
+            return counts
+
+        except Exception as e:
+            logger.error(f"Batch processing failed: {str(e)}")
+            raise
+
     def get_retriever(self, k: int = 3, score_threshold: float = 0.7):
         """Create a retriever with configurable parameters"""
         if not self.vector_store:
@@ -112,10 +230,232 @@ class VectorDatabase:
             search_kwargs={
                 "k": k,
                 "score_threshold": score_threshold,
-                "params": {"nprobe": 10}
+                "params": self.search_params["params"]
             }
         )
 
+    def delete_by_source(self, source: str) -> int:
+        """Delete every chunk stored for a source, returning the number removed"""
+        if not self.vector_store:
+            raise RuntimeError("Database not connected. Call connect() first.")
+
+        expr = f'source == "{self._escape(source)}"'
+        try:
+            with self._write_lock:
+                collection = Collection(self.collection_name)
+                # Strong, so chunks written by other processes (e.g. the ingest CLI) are seen
+                deleted = self._count(collection, expr, strong=True)
+                if deleted:
+                    collection.delete(expr)
+
+                # Chunks a running bulk import has staged for this source
+                if self._import is not None:
+                    deleted += self._import.discard_source(source)
+                    self._import.touch([source])
+
+            logger.info(f"Deleted {deleted} chunks from source: {source}")
+            return deleted
+
+        except Exception as e:
+            logger.error(f"Delete failed for source {source}: {str(e)}")
+            raise
+
+    @contextmanager
+    def bulk_import(self, replace: bool = False):
+        """
+        Defer indexing while loading a large batch of documents
+
+        Yields a BulkImport whose writes go to an unindexed staging
+        collection; every other write keeps going to the serving collection.
+        On exit the serving rows are copied in (unless replace is True), the
+        staging collection is indexed once with parameters sized to the final
+        row count and loaded, and the alias is moved to it. Live writes only
+        wait for a final catch-up of the sources they touched during the copy
+        and for the swap; queries are never interrupted.
+
+        Args:
+            replace: Discard the current contents instead of merging them
+        """
+        if not self.vector_store:
+            raise RuntimeError("Database not connected. Call connect() first.")
+        if self._is_legacy():
+            raise RuntimeError(
+                f"{self.collection_name} is not an alias yet; run migrate_legacy_collection() first"
+            )
+        if not self._lifecycle_lock.acquire(blocking=False):
+            raise RuntimeError("Another index operation is already running")
+
+        staging_name = self._new_collection_name()
+        importer: Optional[BulkImport] = None
+        self.index_status.update(state="loading", error=None)
+        try:
+            importer = BulkImport(self, Collection(
+                name=staging_name,
+                schema=self._collection_schema(self._resolve_active_collection()),
+                consistency_level=config.MILVUS_CONSISTENCY_LEVEL
+            ))
+            self._import = importer
+            logger.info(f"Bulk import staging into collection: {staging_name}")
+
+            yield importer
+
+            importer.close()
+            source_name = self._require_active_collection()
+            if not replace:
+                # Live writes continue meanwhile; the sources they touch are copied again below
+                self.index_status.update(state="copying")
+                self._copy_rows(source_name, importer.collection)
+
+            self.index_status.update(state="building")
+            index_params = self._build_index(importer.collection)
+
+            self.index_status.update(state="swapping")
+            with self._write_lock:
+                self._catch_up(importer, source_name, replace)
+                self._swap(source_name, staging_name, index_params)
+                self._import = None
+            self.index_status.update(state="idle", last_build=time.time())
+
+        except Exception as e:
+            logger.error(f"Bulk import failed: {str(e)}")
+            self.index_status.update(state="failed", error=str(e))
+            self._drop_unless_serving(staging_name)
+            raise
+        finally:
+            if importer is not None:
+                importer.close()
+            self._import = None
+            self._lifecycle_lock.release()
+
+    def rebuild_index(self) -> None:
+        """Rebuild the index with parameters scaled to the current row count"""
+        with self.bulk_import():
+            pass
+
+    def migrate_legacy_collection(self) -> None:
+        """
+        Move a collection created before aliases were used behind the alias
+
+        The legacy rows are copied into a new collection and the copy is
+        verified before the legacy collection is dropped. Milvus cannot create
+        an alias while a collection holds the same name, so queries from other
+        clients fail for the moment between the drop and the alias creation.
+        Run this once, during a quiet period.
+        """
+        if not self.vector_store:
+            raise RuntimeError("Database not connected. Call connect() first.")
+        if not self._is_legacy():
+            logger.info(f"{self.collection_name} is already an alias; nothing to migrate")
+            return
+        if not self._lifecycle_lock.acquire(blocking=False):
+            raise RuntimeError("Another index operation is already running")
+
+        new_name = self._new_collection_name()
+        legacy_dropped = False
+        self.index_status.update(state="migrating", error=None)
+        try:
+            with self._write_lock:
+                legacy = Collection(self.collection_name)
+                target = Collection(
+                    name=new_name,
+                    schema=legacy.schema,
+                    consistency_level=config.MILVUS_CONSISTENCY_LEVEL
+                )
+                legacy_rows = self._count(legacy, "", strong=True)
+                copied = self._copy_rows(self.collection_name, target)
+                index_params = self._build_index(target)
+                if copied != legacy_rows or self._count(target, "", strong=True) != legacy_rows:
+                    raise RuntimeError(f"Copied {copied} of {legacy_rows} rows; legacy collection kept")
+
+                legacy.release()
+                utility.drop_collection(self.collection_name)
+                legacy_dropped = True
+                utility.create_alias(new_name, self.collection_name)
+
+                self.active_collection = new_name
+                self.vector_store = self._open_store(index_params)
+                for listener in self._swap_listeners:
+                    listener()
+            self.index_status.update(state="idle", last_build=time.time())
+            logger.info(f"Migrated {legacy_rows} rows from legacy collection to {new_name}")
+
+        except Exception as e:
+            self.index_status.update(state="failed", error=str(e))
+            if legacy_dropped:
+                # The data now lives only in new_name: never drop it here
+                logger.critical(
+                    f"Legacy collection dropped but alias creation failed; "
+                    f"create alias {self.collection_name} -> {new_name} manually: {str(e)}"
+                )
+            else:
+                logger.error(f"Legacy migration failed: {str(e)}")
+                self._drop_unless_serving(new_name)
+            raise
+        finally:
+            self._lifecycle_lock.release()
+
+    def drop_staging_collection(self, name: str) -> bool:
+        """
+        Drop the staging collection of a bulk import that never swapped in
+
+        Only the named collection is touched: other processes may be running
+        bulk imports of their own. Returns False if it is gone or serving.
+        """
+        if not self.vector_store:
+            raise RuntimeError("Database not connected. Call connect() first.")
+
+        if not utility.has_collection(name):
+            return False
+        if self._resolve_active_collection() == name:
+            logger.info(f"Keeping {name}: it is serving {self.collection_name}")
+            return False
+        utility.drop_collection(name)
+        return True
+
+    def is_index_operation_running(self) -> bool:
+        """Check whether a bulk import or rebuild holds the lifecycle lock"""
+        return self._lifecycle_lock.locked()
+
+    def add_swap_listener(self, listener: Callable[[], None]) -> None:
+        """Register a callback invoked after a new collection starts serving"""
+        self._swap_listeners.append(listener)
+
+    def stats(self) -> Dict[str, Any]:
+        """Row counts and index state of the serving collection"""
+        if not self.vector_store:
+            raise RuntimeError("Database not connected. Call connect() first.")
+
+        self.active_collection = self._resolve_active_collection()
+        stats: Dict[str, Any] = {
+            "collection": self.collection_name,
+            "active_collection": self.active_collection,
+            "legacy": self._is_legacy(),
+            "row_count": 0,
+            "index": None,
+            "load_state": None,
+            "search_params": self.search_params,
+            "index_status": dict(self.index_status),
+        }
+        importer = self._import
+        if importer is not None:
+            stats["staging_collection"] = importer.collection.name
+
+        if self.active_collection is None:
+            return stats
+
+        collection = Collection(self.active_collection)
+        stats["row_count"] = self._count(collection, "")
+        stats["load_state"] = utility.load_state(self.active_collection).name
+        index_params = self._current_index_params(collection)
+        if index_params:
+            progress = utility.index_building_progress(self.active_collection)
+            stats["index"] = {
+                **index_params,
+                "indexed_rows": progress.get("indexed_rows"),
+                "pending_index_rows": progress.get("pending_index_rows"),
+            }
+        return stats
+
     def disconnect(self):
         """Clean up connection"""
         try:
@@ -126,4 +466,320 @@ class VectorDatabase:
 
     def is_connected(self) -> bool:
         """Check connection status"""
-        return self.vector_store is not None
\ No newline at end of file
+        return self.vector_store is not None
+
+    def _split_documents(self, documents: List[Tuple[str, str]]) -> Tuple[List[str], List[dict], List[int]]:
+        """Chunk (content, source) pairs into texts, metadatas and per-document counts"""
+        texts: List[str] = []
+        metadatas: List[dict] = []
+        counts: List[int] = []
+        for content, source in documents:
+            if not content or not isinstance(content, str):
+                raise ValueError(f"Content must be a non-empty string: {source}")
+
+            chunks = self.text_splitter.split_text(content)
+            texts.extend(chunks)
+            metadatas.extend({"source": source, "chunk_idx": i} for i in range(len(chunks)))
+            counts.append(len(chunks))
+        return texts, metadatas, counts
+
+    def _store_chunks(self, chunks: List[str], metadatas: List[dict]) -> None:
+        """Write chunks to the serving collection"""
+        if not chunks:
+            return
+        with self._write_lock:
+            self.vector_store.add_texts(texts=chunks, metadatas=metadatas)
+            # A running bulk import must copy these sources again before swapping
+            if self._import is not None:
+                self._import.touch(metadata["source"] for metadata in metadatas)
+
+    # Index lifecycle helpers
+    def _open_store(self, index_params: dict) -> Milvus:
+        """Create a LangChain store bound to the alias, so Milvus resolves it per call"""
+        nlist = index_params.get("params", {}).get("nlist", MIN_NLIST)
+        self.search_params = self._search_params(nlist)
+        return Milvus(
+            embedding_function=self.embedding_wrapper,
+            collection_name=self.collection_name,
+            connection_args={
+                "host": self.host,
+                "port": self.port
+            },
+            consistency_level=config.MILVUS_CONSISTENCY_LEVEL,
+            auto_id=True,
+            index_params=index_params,
+            search_params=self.search_params,
+            drop_old=False  # Important to keep existing data
+        )
+
+    def _new_collection_name(self) -> str:
+        """Timestamped, randomised name for a new physical collection"""
+        name = f"{self.collection_name}_{time.strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        # Collection(name, schema) would silently attach to an existing collection
+        if utility.has_collection(name):
+            raise RuntimeError(f"Collection {name} already exists")
+        return name
+
+    def _resolve_active_collection(self) -> Optional[str]:
+        """Physical collection behind the alias, the legacy collection, or None"""
+        for name in utility.list_collections():
+            if self.collection_name in utility.list_aliases(name):
+                return name
+        if self.collection_name in utility.list_collections():
+            return self.collection_name
+        return None
+
+    def _require_active_collection(self) -> str:
+        """Resolve the serving collection, failing loudly if it has gone missing"""
+        name = self._resolve_active_collection()
+        if name is None or not utility.has_collection(name):
+            raise RuntimeError(f"No collection is serving {self.collection_name}")
+        return name
+
+    def _is_legacy(self) -> bool:
+        """True when COLLECTION_NAME is a physical collection rather than an alias"""
+        return self._resolve_active_collection() == self.collection_name
+
+    def _bootstrap_collection(self) -> str:
+        """Create an empty, indexed collection behind the alias on first start"""
+        name = self._new_collection_name()
+        collection = Collection(
+            name=name,
+            schema=self._collection_schema(None),
+            consistency_level=config.MILVUS_CONSISTENCY_LEVEL
+        )
+        self._build_index(collection)
+        utility.create_alias(name, self.collection_name)
+        logger.info(f"Created collection {name} behind alias {self.collection_name}")
+        return name
+
+    def _collection_schema(self, source_name: Optional[str]) -> CollectionSchema:
+        """Schema of an existing collection, or the one LangChain would create"""
+        if source_name is not None:
+            return Collection(source_name).schema
+
+        return CollectionSchema([
+            FieldSchema("source", DataType.VARCHAR, max_length=65_535),
+            FieldSchema("chunk_idx", DataType.INT64),
+            FieldSchema("text", DataType.VARCHAR, max_length=65_535),
+            FieldSchema("pk", DataType.INT64, is_primary=True, auto_id=True),
+            FieldSchema("vector", DataType.FLOAT_VECTOR, dim=config.EMBEDDING_DIM),
+        ])
+
+    def _copy_rows(self, source_name: str, target: Collection, expr: str = "") -> int:
+        """Copy the rows of a loaded collection matching expr (default all) into another one"""
+        if not utility.has_collection(source_name):
+            raise RuntimeError(f"Source collection {source_name} does not exist")
+
+        source = Collection(source_name)
+        fields = [field.name for field in source.schema.fields if not field.auto_id]
+        iterator = source.query_iterator(
+            batch_size=config.BULK_INSERT_BATCH_SIZE,
+            expr=expr,
+            output_fields=fields
+        )
+        copied = 0
+        try:
+            while True:
+                rows = iterator.next()
+                if not rows:
+                    break
+                target.insert([{name: row[name] for name in fields} for row in rows])
+                copied += len(rows)
+        finally:
+            iterator.close()
+
+        logger.info(f"Copied {copied} rows from {source_name} to {target.name}")
+        return copied
+
+    def _catch_up(self, importer: BulkImport, source_name: str, replace: bool) -> None:
+        """Apply writes made while the staging collection was copied and indexed (write lock held)"""
+        if self._require_active_collection() != source_name:
+            raise RuntimeError(f"{self.collection_name} was swapped by another process during the import")
+
+        staging = importer.collection
+        importer.replay_deletes()
+        if not replace:
+            # Replace each touched source's copied rows with its current serving rows
+            touched = importer.take_touched()
+            for source in touched:
+                expr = f'source == "{self._escape(source)}"'
+                staged = importer.staged_keys(source)
+                staging.delete(f"{expr} and {importer.pk_field} not in {staged}" if staged else expr)
+                self._copy_rows(source_name, staging, expr=expr)
+            logger.info(f"Caught up {len(touched)} sources written during the import")
+
+        serving_rows = 0 if replace else self._count(Collection(source_name), "", strong=True)
+        expected = serving_rows + importer.staged_rows()
+        staged_total = self._count(staging, "", strong=True)
+        if staged_total != expected:
+            raise RuntimeError(
+                f"{staging.name} has {staged_total} rows, expected {expected}; "
+                f"{source_name} was probably written by another process during the import"
+            )
+
+    def _build_index(self, collection: Collection) -> dict:
+        """Flush, index and load a collection, waiting until every row is indexed"""
+        collection.flush()
+        num_rows = collection.num_entities
+        index_params = self._index_params(num_rows)
+        vector_field = next(
+            field.name for field in collection.schema.fields
+            if field.dtype == DataType.FLOAT_VECTOR
+        )
+
+        logger.info(f"Building index on {collection.name} for {num_rows} rows: {index_params}")
+        collection.create_index(vector_field, index_params)
+        utility.wait_for_index_building_complete(collection.name)
+        collection.load()
+        return index_params
+
+    def _swap(self, old_name: str, new_name: str, index_params: dict) -> None:
+        """Move the alias to a new collection, then retire the old one"""
+        if old_name == new_name:
+            raise RuntimeError(f"Refusing to swap {old_name} with itself")
+
+        # Nothing is dropped unless the alias has moved; if this raises, the
+        # old collection is still serving and untouched
+        utility.alter_alias(new_name, self.collection_name)
+
+        self.active_collection = new_name
+        self.search_params = self._search_params(index_params["params"]["nlist"])
+        self.vector_store.search_params = self.search_params
+        for listener in self._swap_listeners:
+            listener()
+
+        try:
+            Collection(old_name).release()
+            utility.drop_collection(old_name)
+        except Exception as e:
+            logger.warning(f"Swapped to {new_name} but could not drop {old_name}: {str(e)}")
+
+        logger.info(f"Swapped serving collection {old_name} -> {new_name}")
+
+    def _drop_unless_serving(self, name: str) -> None:
+        """Drop a collection after a failed operation, unless the alias points at it"""
+        try:
+            if self._resolve_active_collection() == name:
+                logger.warning(f"Keeping {name}: it is serving {self.collection_name}")
+                return
+            if utility.has_collection(name):
+                utility.drop_collection(name)
+        except Exception as e:
+            logger.error(f"Could not clean up collection {name}: {str(e)}")
+
+    @staticmethod
+    def _index_params(num_rows: int) -> dict:
+        """IVF_FLAT parameters sized to the number of rows"""
+        nlist = int(4 * math.sqrt(max(num_rows, 1)))
+        nlist = min(MAX_NLIST, max(MIN_NLIST, nlist))
+        return {
+            "index_type": "IVF_FLAT",
+            "metric_type": "L2",
+            "params": {"nlist": nlist}
+        }
+
+    @staticmethod
+    def _search_params(nlist: int) -> dict:
+        """Search parameters matching an IVF index with the given nlist"""
+        nprobe = min(MAX_NPROBE, max(MIN_NPROBE, nlist // 16))
+        return {"metric_type": "L2", "params": {"nprobe": nprobe}}
+
+    @staticmethod
+    def _current_index_params(collection: Collection) -> Optional[dict]:
+        """Index parameters of a collection, or None if it has no index"""
+        if not collection.indexes:
+            return None
+        return dict(collection.indexes[0].params)
+
+    @staticmethod
+    def _count(collection: Collection, expr: str, strong: bool = False) -> int:
+        """Count rows matching an expression, optionally seeing every client's writes"""
+        kwargs = {"consistency_level": "Strong"} if strong else {}
+        result = collection.query(expr=expr, output_fields=["count(*)"], **kwargs)
+        return result[0]["count(*)"] if result else 0
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        """Escape a string for use inside a Milvus boolean expression"""
+        return value.replace("\\", "\\\\").replace('"', '\\"')
+
+class LocalVectorDatabase(VectorDatabase):
+    """VectorDatabase backed by a local file instead of a Milvus server"""
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__()
+        self.path = path or config.LOCAL_VECTOR_PATH
+        self.active_collection = self.path
+
+    def connect(self) -> None:
+        """Open (or create) the local vector file"""
+        try:
+            self.vector_store = LocalVectorStore(self.embedding_wrapper, self.path)
+            logger.info(f"Opened local vector store: {self.path}")
+        except Exception as e:
+            logger.error(f"Connection failed: {str(e)}")
+            raise
+
+    def delete_by_source(self, source: str) -> int:
+        """Delete every chunk stored for a source, returning the number removed"""
+        if not self.vector_store:
+            raise RuntimeError("Database not connected. Call connect() first.")
+
+        deleted = self.vector_store.delete_where("source", source)
+        logger.info(f"Deleted {deleted} chunks from source: {source}")
+        return deleted
+
+    @contextmanager
+    def bulk_import(self, replace: bool = False):
+        """Brute-force search has no index to defer; writes go straight to the file"""
+        if not self.vector_store:
+            raise RuntimeError("Database not connected. Call connect() first.")
+        if replace:
+            raise ValueError("Local backend does not support replacing contents on import")
+        yield self
+
+    def rebuild_index(self) -> None:
+        """Nothing to rebuild for brute-force search"""
+        self.index_status.update(last_build=time.time())
+
+    def migrate_legacy_collection(self) -> None:
+        """The local store has no collections or aliases to migrate"""
+
+    def drop_staging_collection(self, name: str) -> bool:
+        """The local store never stages writes"""
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Row count of the local store"""
+        if not self.vector_store:
+            raise RuntimeError("Database not connected. Call connect() first.")
+
+        return {
+            "collection": self.path,
+            "active_collection": self.path,
+            "row_count": self.vector_store.count(),
+            "index": None,
+            "load_state": "Loaded",
+            "search_params": None,
+            "index_status": dict(self.index_status),
+        }
+
+    def disconnect(self):
+        """Nothing to clean up for the local store"""
+        logger.info("Closed local vector store")
+
+def create_database(backend: Optional[str] = None, path: Optional[str] = None) -> VectorDatabase:
+    """
+    Build a vector database
+
+    Args:
+        backend: "milvus" or "local" (defaults to VECTOR_BACKEND)
+        path: File used by the local backend (defaults to LOCAL_VECTOR_PATH)
+    """
+    backend = (backend or config.VECTOR_BACKEND).lower()
+    if backend == "local":
+        return LocalVectorDatabase(path)
+    if backend != "milvus":
+        raise ValueError(f"Unknown vector backend: {backend}")
+    return VectorDatabase()
@@ -2,11 +2,15 @@ import pdfplumber
 import pytesseract
 import requests
 from bs4 import BeautifulSoup
-from PIL import Image
+from PIL import Image, ImageSequence
 from io import BytesIO
+from pathlib import Path
+from xml.etree import ElementTree
 import logging
+import re
 import validators
-from typing import Union
+import zipfile
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 logging.basicConfig(
     level=logging.INFO,
@@ -14,6 +18,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Bytes read from the start of a file to detect its format
+SNIFF_BYTES = 4096
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# Uncompressed size limit of a DOCX body; upload limits only bound the compressed size
+MAX_DOCX_XML_SIZE = 256 * 1024 * 1024
+
+class UnsupportedFormatError(ValueError):
+    """Raised when no extractor is registered for a document's content"""
+
+class DocumentTooLargeError(ValueError):
+    """Raised when a document expands beyond what extraction accepts"""
+
+def _html_to_text(html: Union[str, bytes]) -> str:
+    """Strip boilerplate elements from HTML and return its visible text"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Remove unwanted elements
+    for element in soup(['script', 'style', 'nav', 'footer', 'iframe', 'noscript']):
+        element.decompose()
+
+    # Get text with proper spacing
+    return ' '.join(soup.stripped_strings)
+
+def _ocr_image(img: Image.Image) -> str:
+    """Run OCR on a single image frame"""
+    # Enhance OCR accuracy with basic image processing
+    img = img.convert('L')  # Convert to grayscale
+    img = img.point(lambda x: 0 if x < 128 else 255, '1')  # Binarize
+
+    return pytesseract.image_to_string(img).strip()
+
 def extract_from_url(url: str) -> str:
     """Extract text content from a webpage URL"""
     try:
@@ -28,14 +65,7 @@ def extract_from_url(url: str) -> str:
         response = requests.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Remove unwanted elements
-        for element in soup(['script', 'style', 'nav', 'footer', 'iframe', 'noscript']):
-            element.decompose()
-            
-        # Get text with proper spacing
-        text = ' '.join(soup.stripped_strings)
+        text = _html_to_text(response.text)
         logger.info(f"Extracted {len(text)} characters from URL: {url}")
         return text
         
@@ -51,12 +81,7 @@ def extract_from_image(file_stream: BytesIO) -> str:
     try:
         img = Image.open(file_stream)
         
-        # Enhance OCR accuracy with basic image processing
-        img = img.convert('L')  # Convert to grayscale
-        img = img.point(lambda x: 0 if x < 128 else 255, '1')  # Binarize
-        
-        text = pytesseract.image_to_string(img)
-        text = text.strip()
+        text = _ocr_image(img)
         logger.info(f"Extracted {len(text)} characters from image")
         return text
         
@@ -64,19 +89,218 @@ def extract_from_image(file_stream: BytesIO) -> str:
         logger.error(f"Image extraction failed: {str(e)}")
         raise
 
+def extract_from_tiff(file_stream: BinaryIO) -> str:
+    """Extract text from every page of a (multi-page) TIFF using OCR"""
+    try:
+        img = Image.open(file_stream)
+        pages = [_ocr_image(frame) for frame in ImageSequence.Iterator(img)]
+
+        text = "\n".join(page for page in pages if page).strip()
+        logger.info(f"Extracted {len(text)} characters from {len(pages)}-page TIFF")
+        return text
+
+    except Exception as e:
+        logger.error(f"TIFF extraction failed: {str(e)}")
+        raise
+
 def extract_from_pdf(file_stream: BytesIO) -> str:
     """Extract text from PDF document"""
     try:
         with pdfplumber.open(file_stream) as pdf:
-            text = "\n".join(
-                page.extract_text() or "" 
-                for page in pdf.pages
-                if page.extract_text() is not None
-            )
+            # extract_text() re-parses the page, so call it once per page
+            pages = [page.extract_text() for page in pdf.pages]
+            text = "\n".join(page for page in pages if page is not None)
         text = text.strip()
         logger.info(f"Extracted {len(text)} characters from PDF")
         return text
         
     except Exception as e:
         logger.error(f"PDF extraction failed: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+def _docx_paragraph_text(paragraph: ElementTree.Element) -> str:
+    """Text of a WordprocessingML paragraph, with tabs and line breaks"""
+    parts = []
+    for node in paragraph.iter():
+        if node.tag == f"{WORD_NS}t":
+            parts.append(node.text or "")
+        elif node.tag == f"{WORD_NS}tab":
+            parts.append("\t")
+        elif node.tag in (f"{WORD_NS}br", f"{WORD_NS}cr"):
+            parts.append("\n")
+    return "".join(parts)
+
+def extract_from_docx(file_stream: BinaryIO) -> str:
+    """Extract paragraph text from a Word (.docx) document"""
+    try:
+        paragraphs = []
+        with zipfile.ZipFile(file_stream) as docx:
+            # Reject zip bombs before decompressing anything
+            size = docx.getinfo("word/document.xml").file_size
+            if size > MAX_DOCX_XML_SIZE:
+                raise DocumentTooLargeError(
+                    f"DOCX body expands to {size} bytes (limit {MAX_DOCX_XML_SIZE})"
+                )
+
+            # Stream-parse, discarding each paragraph once its text is taken
+            with docx.open("word/document.xml") as xml:
+                for _, element in ElementTree.iterparse(xml):
+                    if element.tag == f"{WORD_NS}p":
+                        paragraphs.append(_docx_paragraph_text(element))
+                        element.clear()
+
+        text = "\n".join(p for p in paragraphs if p.strip()).strip()
+        logger.info(f"Extracted {len(text)} characters from DOCX")
+        return text
+
+    except Exception as e:
+        logger.error(f"DOCX extraction failed: {str(e)}")
+        raise
+
+def extract_from_html(file_stream: BinaryIO) -> str:
+    """Extract visible text from an HTML document"""
+    try:
+        # BeautifulSoup detects the encoding from bytes (meta charset, BOM)
+        text = _html_to_text(file_stream.read())
+        logger.info(f"Extracted {len(text)} characters from HTML")
+        return text
+
+    except Exception as e:
+        logger.error(f"HTML extraction failed: {str(e)}")
+        raise
+
+def extract_from_text(file_stream: BinaryIO) -> str:
+    """Read a plain text or Markdown document"""
+    try:
+        data = file_stream.read()
+        encoding = _bom_encoding(data)
+        if encoding:
+            text = data.decode(encoding)
+        else:
+            try:
+                text = data.decode("utf-8")
+            except UnicodeDecodeError:
+                text = data.decode("latin-1")
+
+        text = text.strip()
+        logger.info(f"Extracted {len(text)} characters from text")
+        return text
+
+    except Exception as e:
+        logger.error(f"Text extraction failed: {str(e)}")
+        raise
+
+# Extractor registry: format name -> extractor taking a seekable binary stream
+EXTRACTORS: Dict[str, Callable[[BinaryIO], str]] = {
+    "pdf": extract_from_pdf,
+    "image": extract_from_image,
+    "tiff": extract_from_tiff,
+    "docx": extract_from_docx,
+    "html": extract_from_html,
+    "text": extract_from_text,
+    "markdown": extract_from_text,
+}
+
+# Leading bytes identifying binary formats, checked in order
+MAGIC_NUMBERS: List[Tuple[bytes, str]] = [
+    (b"%PDF-", "pdf"),
+    (b"II*\x00", "tiff"),
+    (b"MM\x00*", "tiff"),
+    (b"\x89PNG\r\n\x1a\n", "image"),
+    (b"\xff\xd8\xff", "image"),
+    (b"GIF87a", "image"),
+    (b"GIF89a", "image"),
+]
+
+# Byte order marks of Unicode text; UTF-32 LE starts with the UTF-16 LE mark, so it goes first
+BYTE_ORDER_MARKS: List[Tuple[bytes, str]] = [
+    (b"\xff\xfe\x00\x00", "utf-32"),
+    (b"\x00\x00\xfe\xff", "utf-32"),
+    (b"\xef\xbb\xbf", "utf-8-sig"),
+    (b"\xff\xfe", "utf-16"),
+    (b"\xfe\xff", "utf-16"),
+]
+
+# Tags that mark text without a <!doctype> or <html> wrapper as an HTML fragment
+HTML_TAG = re.compile(r"<(!doctype\s+html|html|head|body|div|p|span|table|ul|ol|li|br|h[1-6])[\s>/]", re.IGNORECASE)
+
+# Sizes of the BMP info header that follows the 14-byte file header
+BMP_INFO_HEADER_SIZES = {12, 40, 52, 56, 64, 108, 124}
+
+# File extensions picked up when walking directories; content still decides the format
+EXTENSIONS: Dict[str, str] = {
+    ".pdf": "pdf",
+    ".png": "image", ".jpg": "image", ".jpeg": "image", ".gif": "image",
+    ".bmp": "image", ".webp": "image",
+    ".tif": "tiff", ".tiff": "tiff",
+    ".docx": "docx",
+    ".html": "html", ".htm": "html",
+    ".txt": "text",
+    ".md": "markdown", ".markdown": "markdown",
+}
+
+def register_extractor(fmt: str, extractor: Callable[[BinaryIO], str],
+                       magic: Iterable[bytes] = (), extensions: Iterable[str] = ()) -> None:
+    """Register an extractor for a format, with optional magic numbers and extensions"""
+    EXTRACTORS[fmt] = extractor
+    MAGIC_NUMBERS.extend((prefix, fmt) for prefix in magic)
+    EXTENSIONS.update((ext.lower(), fmt) for ext in extensions)
+
+def _bom_encoding(data: bytes) -> Optional[str]:
+    """Return the codec for text starting with a Unicode byte order mark, if any"""
+    for bom, encoding in BYTE_ORDER_MARKS:
+        if data.startswith(bom):
+            return encoding
+    return None
+
+def _looks_like_text(head: bytes) -> bool:
+    """Heuristic: text in UTF-8 or an 8-bit encoding has no control characters besides whitespace"""
+    return not any(byte < 0x20 and byte not in b"\t\n\r\f" for byte in head)
+
+def sniff_format(file_stream: BinaryIO, filename: str = "") -> str:
+    """Detect a document's format from its content, using the name only to tell text formats apart"""
+    head = file_stream.read(SNIFF_BYTES)
+    file_stream.seek(0)
+
+    for prefix, fmt in MAGIC_NUMBERS:
+        if head.startswith(prefix):
+            return fmt
+
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image"
+    if head[:2] == b"BM" and int.from_bytes(head[14:18], "little") in BMP_INFO_HEADER_SIZES:
+        return "image"
+
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(file_stream) as archive:
+                names = set(archive.namelist())
+        except zipfile.BadZipFile as e:
+            raise UnsupportedFormatError(f"Corrupt ZIP-based document: {str(e)}")
+        finally:
+            file_stream.seek(0)
+        if "word/document.xml" in names:
+            return "docx"
+        raise UnsupportedFormatError("Unsupported ZIP-based document")
+
+    encoding = _bom_encoding(head)
+    if encoding:
+        # The head may end mid-character; drop the partial one
+        text = head.decode(encoding, errors="ignore")
+    elif head and _looks_like_text(head):
+        text = head.decode("utf-8", errors="ignore")
+    else:
+        raise UnsupportedFormatError(f"Unrecognised document format: {filename or 'upload'}")
+
+    hinted = EXTENSIONS.get(Path(filename).suffix.lower())
+    if hinted in ("html", "markdown"):
+        return hinted
+    if HTML_TAG.search(text[:1024]):
+        return "html"
+    return "text"
+
+def extract_document(file_stream: BinaryIO, filename: str = "") -> Tuple[str, str]:
+    """Sniff a document's format and extract its text, returning (format, text)"""
+    fmt = sniff_format(file_stream, filename)
+    logger.info(f"Detected {fmt} content for: {filename or 'upload'}")
+    return fmt, EXTRACTORS[fmt](file_stream)
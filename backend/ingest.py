@@ -0,0 +1,335 @@
+"""
+Offline bulk ingestion of document trees
+
+Extraction runs in a process pool, with formats detected from file
+content; chunks are embedded and inserted in batches from the main
+process. Progress is checkpointed so an interrupted run can be resumed
+with the same command.
+
+    python -m backend.ingest ./archive --workers 8 --checkpoint ingest.ckpt
+    python -m backend.ingest --manifest files.txt --backend local
+"""
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from .document_processor import extract_from_url, extract_document, EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+def is_url(item: str) -> bool:
+    return item.startswith(("http://", "https://"))
+
+def iter_items(paths: List[str], manifest: Optional[str] = None) -> Iterator[str]:
+    """Yield files under the given paths and entries of a manifest, in a stable order"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if Path(name).suffix.lower() in EXTENSIONS:
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+    if manifest:
+        with open(manifest, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield line
+
+def extract_item(item: str) -> Tuple[str, str, str, Optional[str]]:
+    """
+    Extract text from one file or URL; runs in a worker process
+
+    Returns:
+        (item, source, content, error), with the source labelled by the
+        sniffed format the same way the API labels uploads
+    """
+    try:
+        if is_url(item):
+            return item, f"url:{item}", extract_from_url(item), None
+
+        with open(item, "rb") as f:
+            fmt, content = extract_document(f, item)
+        return item, f"{fmt}:{item}", content, None
+
+    except Exception as e:
+        return item, "", "", f"{type(e).__name__}: {str(e)}"
+
+def load_checkpoint(path: str) -> Tuple[Set[str], Dict[str, Optional[str]], Set[str]]:
+    """
+    Read a checkpoint file
+
+    Returns:
+        (done items, {item: source} of items started but not done, staging
+        collections created by --defer-index runs that never swapped in)
+    """
+    done: Set[str] = set()
+    started: Dict[str, Optional[str]] = {}
+    staging: Set[str] = set()
+    if not os.path.exists(path):
+        return done, started, staging
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn write from a crash
+            if "staging" in entry:
+                if entry["status"] == "staging":
+                    staging.add(entry["staging"])
+                else:
+                    staging.discard(entry["staging"])
+            elif entry["status"] == "done":
+                done.add(entry["item"])
+                started.pop(entry["item"], None)
+            elif entry["item"] not in done:
+                # Entries written before sources were recorded have none
+                started[entry["item"]] = entry.get("source")
+
+    return done, started, staging
+
+class Ingester:
+    """Drives extraction, batched storage, checkpointing and progress reporting"""
+
+    def __init__(self, db, checkpoint_path: str, failure_log_path: str,
+                 workers: int, batch_size: int, report_every: float = 10.0):
+        self.db = db
+        self.workers = workers
+        self.batch_size = batch_size
+        self.report_every = report_every
+        self.checkpoint = open(checkpoint_path, "a", encoding="utf-8")
+        self.failure_log = open(failure_log_path, "a", encoding="utf-8")
+
+        # While indexing is deferred, "done" only becomes true after the swap
+        self.defer_done = False
+        self.pending_done: List[Dict] = []
+
+        self.files = 0
+        self.chunks = 0
+        self.failed = 0
+        self.started_at = time.monotonic()
+        self.last_report = self.started_at
+
+    def run(self, items: List[str]) -> None:
+        batch: List[Tuple[str, str, str]] = []
+        remaining = iter(items)
+        in_flight: Dict[Future, str] = {}
+
+        pool = self._new_pool()
+        try:
+            self._submit(pool, in_flight, remaining)
+            while in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                crashed: List[str] = []
+                for future in finished:
+                    item = in_flight.pop(future)
+                    try:
+                        self._collect(future.result(), batch)
+                    except BrokenProcessPool:
+                        crashed.append(item)
+                    except Exception as e:
+                        self._record_failure([item], f"{type(e).__name__}: {str(e)}")
+
+                if crashed:
+                    # A dead worker (OOM, native crash) breaks the whole pool and
+                    # every item in flight with it; any of them may be the cause
+                    crashed.extend(in_flight.values())
+                    in_flight.clear()
+                    pool.shutdown(wait=False)
+                    pool = self._isolate(crashed, batch)
+
+                self._submit(pool, in_flight, remaining)
+                if len(batch) >= self.batch_size:
+                    self._store(batch)
+                    batch = []
+                self._report()
+        finally:
+            pool.shutdown()
+
+        if batch:
+            self._store(batch)
+
+    def record_staging(self, collection: str, status: str) -> None:
+        """Checkpoint a --defer-index staging collection ("staging", "swapped" or "dropped")"""
+        self._write(self.checkpoint, {"staging": collection, "status": status})
+
+    def commit_deferred(self) -> None:
+        """Mark items stored during a deferred-index import as done"""
+        for entry in self.pending_done:
+            self._write(self.checkpoint, entry)
+        self.pending_done = []
+
+    def close(self) -> None:
+        self._report(force=True)
+        self.checkpoint.close()
+        self.failure_log.close()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # Spawned, not forked: the parent already runs torch and gRPC threads
+        context = multiprocessing.get_context("spawn")
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+
+    def _submit(self, pool: ProcessPoolExecutor, in_flight: Dict[Future, str], remaining: Iterator[str]) -> None:
+        # Bound the number of extracted documents held in memory
+        while len(in_flight) < self.workers * 4:
+            item = next(remaining, None)
+            if item is None:
+                return
+            in_flight[pool.submit(extract_item, item)] = item
+
+    def _isolate(self, items: List[str], batch: List[Tuple[str, str, str]]) -> ProcessPoolExecutor:
+        """Re-run items lost with a broken pool one at a time, failing the ones that kill a worker"""
+        logger.warning(f"Extraction worker died; retrying {len(items)} items one at a time")
+        pool = self._new_pool()
+        for item in items:
+            try:
+                self._collect(pool.submit(extract_item, item).result(), batch)
+            except BrokenProcessPool:
+                self._record_failure([item], "Extraction worker died (out of memory or crashed)")
+                pool.shutdown(wait=False)
+                pool = self._new_pool()
+            except Exception as e:
+                self._record_failure([item], f"{type(e).__name__}: {str(e)}")
+        return pool
+
+    def _collect(self, result: Tuple[str, str, str, Optional[str]], batch: List[Tuple[str, str, str]]) -> None:
+        item, source, content, error = result
+        if error:
+            self._record_failure([item], error)
+        elif not content:
+            self._record_failure([item], "No text extracted")
+        else:
+            batch.append((item, source, content))
+
+    def _store(self, batch: List[Tuple[str, str, str]]) -> None:
+        items = [item for item, _, _ in batch]
+        for item, source, _ in batch:
+            self._write(self.checkpoint, {"item": item, "source": source, "status": "started"})
+
+        try:
+            counts = self.db.process_contents([(content, source) for _, source, content in batch])
+        except Exception as e:
+            self._record_failure(items, f"{type(e).__name__}: {str(e)}")
+            return
+
+        for item, count in zip(items, counts):
+            entry = {"item": item, "status": "done", "chunks": count}
+            if self.defer_done:
+                self.pending_done.append(entry)
+            else:
+                self._write(self.checkpoint, entry)
+
+        self.files += len(items)
+        self.chunks += sum(counts)
+
+    def _record_failure(self, items: List[str], error: str) -> None:
+        for item in items:
+            self._write(self.failure_log, {"item": item, "error": error, "time": time.time()})
+        self.failed += len(items)
+
+    def _report(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self.last_report < self.report_every:
+            return
+
+        self.last_report = now
+        elapsed = max(now - self.started_at, 1e-9)
+        logger.info(
+            f"Ingested {self.files} files ({self.files / elapsed:.2f} files/s), "
+            f"{self.chunks} chunks ({self.chunks / elapsed:.2f} chunks/s), "
+            f"{self.failed} failed"
+        )
+
+    @staticmethod
+    def _write(f, entry: Dict) -> None:
+        f.write(json.dumps(entry) + "\n")
+        f.flush()
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk-load documents into the vector database")
+    parser.add_argument("paths", nargs="*", help="Files or directories to ingest")
+    parser.add_argument("--manifest", help="File listing one path or URL per line")
+    parser.add_argument("--backend", choices=["milvus", "local"], default=None,
+                        help="Vector backend (defaults to VECTOR_BACKEND)")
+    parser.add_argument("--local-path", help="File used by the local backend")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Extraction processes")
+    parser.add_argument("--batch-size", type=int, default=32,
+                        help="Documents embedded and inserted per batch")
+    parser.add_argument("--checkpoint", default="ingest.checkpoint.jsonl",
+                        help="Progress file used to resume interrupted runs")
+    parser.add_argument("--failure-log", default="ingest.failures.jsonl",
+                        help="Where failed items and their errors are appended")
+    parser.add_argument("--defer-index", action="store_true",
+                        help="Load into an unindexed collection and build the index once at the end")
+    parser.add_argument("--report-every", type=float, default=10.0,
+                        help="Seconds between progress reports")
+    args = parser.parse_args(argv)
+    if not args.paths and not args.manifest:
+        parser.error("Provide at least one path or --manifest")
+    return args
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    # Imported here so spawned extraction workers don't load the embedding stack
+    from .database import BulkImport, create_database
+
+    db = create_database(args.backend, args.local_path)
+    db.connect()
+
+    done, interrupted, staging = load_checkpoint(args.checkpoint)
+    items = [item for item in iter_items(args.paths, args.manifest) if item not in done]
+    logger.info(f"{len(items)} items to ingest ({len(done)} already done)")
+
+    ingester = Ingester(db, args.checkpoint, args.failure_log,
+                        workers=args.workers, batch_size=args.batch_size,
+                        report_every=args.report_every)
+    try:
+        # Only the staging collection a crashed --defer-index run of ours left
+        # behind; others may belong to imports still running elsewhere
+        for name in staging:
+            if db.drop_staging_collection(name):
+                logger.info(f"Dropped stale staging collection: {name}")
+            ingester.record_staging(name, "dropped")
+
+        # Remove partial writes from a batch that was in flight when the last run died
+        for item, source in interrupted.items():
+            if source is None:
+                logger.warning(f"No source recorded for interrupted item, partial chunks kept: {item}")
+                continue
+            db.delete_by_source(source)
+
+        if args.defer_index:
+            ingester.defer_done = True
+            # Only writes through the import handle are staged
+            with db.bulk_import() as importer:
+                staging_name = importer.collection.name if isinstance(importer, BulkImport) else None
+                if staging_name:
+                    ingester.record_staging(staging_name, "staging")
+                ingester.db = importer
+                ingester.run(items)
+            if staging_name:
+                ingester.record_staging(staging_name, "swapped")
+            ingester.commit_deferred()
+        else:
+            ingester.run(items)
+    finally:
+        ingester.close()
+        db.disconnect()
+
+    return 1 if ingester.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, List, Optional
+import json
+import logging
+import os
+import threading
+import uuid
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class LocalVectorStore(VectorStore):
+    """
+    File-backed brute-force vector store for offline ingestion and testing
+
+    Records are appended to a JSONL file. Every read and write takes an
+    fcntl lock on a sidecar ``.lock`` file and first catches up with records
+    other processes have written, so the API and the ingest CLI can share
+    one file.
+    """
+
+    def __init__(self, embedding_function: Embeddings, path: str):
+        self.embedding_function = embedding_function
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self._lock = threading.Lock()
+        self._reset()
+        with self._file_lock(exclusive=False):
+            self._sync()
+        logger.info(f"Loaded {len(self._ids)} chunks from {self.path}")
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding_function
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Embed texts and append them to the store file"""
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        vectors = self.embedding_function.embed_documents(texts)
+        ids = [uuid.uuid4().hex for _ in texts]
+
+        with self._file_lock(exclusive=True):
+            self._sync()
+            with open(self.path, "ab") as f:
+                # Terminate a record torn by a crashed writer so ours stay intact
+                if f.tell() > self._offset:
+                    f.write(b"\n")
+                for record in zip(ids, texts, metadatas, vectors):
+                    f.write(self._encode(record))
+                f.flush()
+                os.fsync(f.fileno())
+            self._sync()
+
+        return ids
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        """Return the k nearest chunks by L2 distance"""
+        query_vector = np.asarray(self.embedding_function.embed_query(query), dtype=np.float32)
+        with self._file_lock(exclusive=False):
+            self._sync()
+            if not self._texts:
+                return []
+            if self._matrix is None:
+                self._matrix = np.asarray(self._vectors, dtype=np.float32)
+            distances = np.linalg.norm(self._matrix - query_vector, axis=1)
+            nearest = np.argsort(distances)[:k]
+            return [
+                Document(page_content=self._texts[i], metadata=dict(self._metadatas[i]))
+                for i in nearest
+            ]
+
+    def delete_where(self, key: str, value: Any) -> int:
+        """Delete every record whose metadata[key] equals value"""
+        with self._file_lock(exclusive=True):
+            # Catch up first so records other processes appended are kept
+            self._sync()
+            keep = [i for i, metadata in enumerate(self._metadatas) if metadata.get(key) != value]
+            deleted = len(self._ids) - len(keep)
+            if deleted:
+                self._ids = [self._ids[i] for i in keep]
+                self._texts = [self._texts[i] for i in keep]
+                self._metadatas = [self._metadatas[i] for i in keep]
+                self._vectors = [self._vectors[i] for i in keep]
+                self._matrix = None
+                self._rewrite()
+            return deleted
+
+    def count(self) -> int:
+        """Number of stored chunks"""
+        with self._file_lock(exclusive=False):
+            self._sync()
+            return len(self._ids)
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        path: str = "local_vectors.jsonl",
+        **kwargs: Any,
+    ) -> "LocalVectorStore":
+        store = cls(embedding_function=embedding, path=path)
+        store.add_texts(texts, metadatas)
+        return store
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Serialise access within this process and, where fcntl exists, across processes"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _reset(self) -> None:
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._metadatas: List[dict] = []
+        self._vectors: List[List[float]] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._inode: Optional[int] = None
+        self._offset = 0
+
+    def _sync(self) -> None:
+        """Read records appended since the last sync, or reload after a rewrite (lock held)"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if self._inode is not None:
+                self._reset()
+            return
+
+        # Another process rewrote the file (delete): start over
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            self._reset()
+            self._inode = stat.st_ino
+        if stat.st_size == self._offset:
+            return
+
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write from a crash; left for the next append to terminate
+                self._offset += len(line)
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt record in {self.path}")
+                    continue
+                self._ids.append(record["id"])
+                self._texts.append(record["text"])
+                self._metadatas.append(record["metadata"])
+                self._vectors.append(record["vector"])
+        self._matrix = None
+
+    def _rewrite(self) -> None:
+        """Atomically replace the store file with the in-memory records (lock held)"""
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            for record in zip(self._ids, self._texts, self._metadatas, self._vectors):
+                f.write(self._encode(record))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        stat = os.stat(self.path)
+        self._inode = stat.st_ino
+        self._offset = stat.st_size
+
+    @staticmethod
+    def _encode(record) -> bytes:
+        return (json.dumps(dict(zip(("id", "text", "metadata", "vector"), record))) + "\n").encode("utf-8")
@@ -0,0 +1,4 @@
+import os
+
+# backend.config requires the key at import time; tests never call the API
+os.environ.setdefault("DEEPSEEK_API_KEY", "test")
@@ -0,0 +1,214 @@
+import threading
+from types import SimpleNamespace
+from typing import Dict, List
+import pytest
+
+pytest.importorskip("pymilvus")
+pytest.importorskip("sentence_transformers")
+
+from backend import database
+from backend.database import (
+    BulkImport, VectorDatabase, MAX_NLIST, MIN_NLIST, MAX_NPROBE, MIN_NPROBE,
+)
+
+FIELDS = [
+    SimpleNamespace(name="source", is_primary=False, auto_id=False),
+    SimpleNamespace(name="chunk_idx", is_primary=False, auto_id=False),
+    SimpleNamespace(name="text", is_primary=False, auto_id=False),
+    SimpleNamespace(name="pk", is_primary=True, auto_id=True),
+    SimpleNamespace(name="vector", is_primary=False, auto_id=False),
+]
+
+class FakeCollection:
+    """In-memory stand-in for a pymilvus Collection with auto_id primary keys"""
+
+    next_pk = 1
+
+    def __init__(self, name: str):
+        self.name = name
+        self.schema = SimpleNamespace(fields=FIELDS)
+        self.rows: List[Dict] = []
+        self.deletes: List[str] = []
+
+    def insert(self, rows: List[Dict]):
+        pks = []
+        for row in rows:
+            pks.append(FakeCollection.next_pk)
+            self.rows.append({**row, "pk": FakeCollection.next_pk})
+            FakeCollection.next_pk += 1
+        return SimpleNamespace(primary_keys=pks)
+
+    def delete(self, expr: str) -> None:
+        self.deletes.append(expr)
+        self.rows = [row for row in self.rows if not self._match(expr, row)]
+
+    def query(self, expr: str, output_fields: List[str], **kwargs):
+        assert output_fields == ["count(*)"]
+        return [{"count(*)": sum(1 for row in self.rows if self._match(expr, row))}]
+
+    def query_iterator(self, batch_size: int, expr: str, output_fields: List[str]):
+        matches = [{name: row[name] for name in output_fields} for row in self.rows if self._match(expr, row)]
+        batches = iter([matches[i:i + batch_size] for i in range(0, len(matches), batch_size)])
+        return SimpleNamespace(next=lambda: next(batches, []), close=lambda: None)
+
+    def sources(self) -> List[str]:
+        return sorted(row["source"] for row in self.rows)
+
+    @staticmethod
+    def _match(expr: str, row: Dict) -> bool:
+        # The boolean expressions used here are valid Python over the row's fields
+        return not expr or eval(expr, {}, dict(row))
+
+class FakeDatabase:
+    """Just enough of VectorDatabase for BulkImport"""
+
+    embedding_wrapper = SimpleNamespace(embed_documents=lambda texts: [[0.0] for _ in texts])
+
+    def _split_documents(self, documents):
+        return VectorDatabase._split_documents(self, documents)
+
+    text_splitter = SimpleNamespace(split_text=lambda content: content.split("|"))
+
+@pytest.fixture
+def collections(monkeypatch):
+    registry: Dict[str, FakeCollection] = {}
+    monkeypatch.setattr(database, "Collection", lambda name, **kwargs: registry[name])
+    monkeypatch.setattr(database.config, "BULK_INSERT_BATCH_SIZE", 2)
+    return registry
+
+def make_db(serving: FakeCollection, collections, monkeypatch) -> VectorDatabase:
+    """A VectorDatabase whose alias rag_docs resolves to serving, without loading a model"""
+    collections["rag_docs"] = serving
+    db = VectorDatabase.__new__(VectorDatabase)
+    db.collection_name = "rag_docs"
+    db._write_lock = threading.Lock()
+    db._import = None
+    db.text_splitter = FakeDatabase.text_splitter
+    db.embedding_wrapper = FakeDatabase.embedding_wrapper
+    db.vector_store = SimpleNamespace(add_texts=lambda texts, metadatas: serving.insert(
+        [{"text": text, "vector": [0.0], **metadata} for text, metadata in zip(texts, metadatas)]
+    ))
+    monkeypatch.setattr(db, "_resolve_active_collection", lambda: serving.name)
+    monkeypatch.setattr(database.utility, "has_collection", lambda name: True)
+    return db
+
+@pytest.mark.parametrize("rows, nlist", [
+    (0, MIN_NLIST),
+    (1_000, MIN_NLIST),
+    (1_000_000, 4000),
+    (10 ** 12, MAX_NLIST),
+])
+def test_index_params_scale_nlist(rows, nlist):
+    params = VectorDatabase._index_params(rows)
+    assert params["index_type"] == "IVF_FLAT"
+    assert params["params"]["nlist"] == nlist
+
+@pytest.mark.parametrize("nlist, nprobe", [
+    (MIN_NLIST, MIN_NPROBE),
+    (4000, 250),
+    (MAX_NLIST, MAX_NPROBE),
+])
+def test_search_params_scale_nprobe(nlist, nprobe):
+    assert VectorDatabase._search_params(nlist)["params"]["nprobe"] == nprobe
+
+def test_escape():
+    assert VectorDatabase._escape('a "quoted" C:\\path') == 'a \\"quoted\\" C:\\\\path'
+    escaped = VectorDatabase._escape('x" or source != "')
+    assert FakeCollection._match(f'source == "{escaped}"', {"source": 'x" or source != "'})
+    assert not FakeCollection._match(f'source == "{escaped}"', {"source": "other"})
+
+def test_bulk_import_tracks_staged_keys_per_source(collections):
+    staging = collections["staging"] = FakeCollection("staging")
+    importer = BulkImport(FakeDatabase(), staging)
+
+    assert importer.process_contents([("a1|a2|a3", "a"), ("b1", "b")]) == [3, 1]
+    assert importer.pk_field == "pk"
+    assert importer.staged_rows() == 4
+    assert len(importer.staged_keys("a")) == 3
+
+def test_bulk_import_replays_discarded_sources_by_key(collections):
+    staging = collections["staging"] = FakeCollection("staging")
+    importer = BulkImport(FakeDatabase(), staging)
+    importer.process_contents([("a1|a2", "a"), ("b1", "b")])
+
+    assert importer.discard_source("a") == 2
+    assert importer.discard_source("missing") == 0
+    # Re-ingested after the delete: must survive the replay
+    importer.process_content("a3", "a")
+    importer.replay_deletes()
+
+    assert staging.sources() == ["a", "b"]
+    assert [row["text"] for row in staging.rows if row["source"] == "a"] == ["a3"]
+    assert importer.staged_rows() == 2
+    assert all(" in [" in expr for expr in staging.deletes)
+
+def test_closed_bulk_import_rejects_writes(collections):
+    importer = BulkImport(FakeDatabase(), FakeCollection("staging"))
+    importer.close()
+    with pytest.raises(RuntimeError):
+        importer.process_content("late", "a")
+
+def test_catch_up_applies_writes_made_during_the_copy(collections, monkeypatch):
+    serving = collections["rag_docs_old"] = FakeCollection("rag_docs_old")
+    staging = collections["rag_docs_new"] = FakeCollection("rag_docs_new")
+    db = make_db(serving, collections, monkeypatch)
+    serving.insert([{"source": s, "chunk_idx": 0, "text": s, "vector": [0.0]} for s in ["a", "a", "b", "c"]])
+
+    importer = BulkImport(db, staging)
+    db._import = importer
+    importer.process_contents([("n1|n2", "new"), ("c2", "c")])
+    importer.close()
+    db._copy_rows(serving.name, staging)
+
+    # Live writes while the index is being built
+    assert db.delete_by_source("b") == 1
+    assert db.delete_by_source("c") == 2  # one serving chunk, one staged
+    db.process_content("a-v2", "a")
+
+    db._catch_up(importer, serving.name, replace=False)
+    assert staging.sources() == serving.sources() + ["new", "new"]
+    assert staging.sources() == ["a", "a", "a", "new", "new"]
+
+def test_catch_up_detects_writes_from_other_processes(collections, monkeypatch):
+    serving = collections["rag_docs_old"] = FakeCollection("rag_docs_old")
+    staging = collections["rag_docs_new"] = FakeCollection("rag_docs_new")
+    db = make_db(serving, collections, monkeypatch)
+    serving.insert([{"source": "a", "chunk_idx": 0, "text": "a", "vector": [0.0]}])
+
+    importer = BulkImport(db, staging)
+    importer.close()
+    db._copy_rows(serving.name, staging)
+    # Not through this process, so not recorded by the import
+    serving.insert([{"source": "other", "chunk_idx": 0, "text": "x", "vector": [0.0]}])
+
+    with pytest.raises(RuntimeError, match="another process"):
+        db._catch_up(importer, serving.name, replace=False)
+
+def test_catch_up_refuses_after_a_foreign_swap(collections, monkeypatch):
+    serving = collections["rag_docs_old"] = FakeCollection("rag_docs_old")
+    db = make_db(serving, collections, monkeypatch)
+    importer = BulkImport(db, FakeCollection("rag_docs_new"))
+
+    with pytest.raises(RuntimeError, match="swapped"):
+        db._catch_up(importer, "rag_docs_older", replace=False)
+
+def test_swap_refuses_to_swap_a_collection_with_itself(monkeypatch):
+    db = VectorDatabase.__new__(VectorDatabase)
+    db.collection_name = "rag_docs"
+    monkeypatch.setattr(database.utility, "alter_alias", pytest.fail)
+    monkeypatch.setattr(database.utility, "drop_collection", pytest.fail)
+
+    with pytest.raises(RuntimeError):
+        db._swap("rag_docs_x", "rag_docs_x", VectorDatabase._index_params(0))
+
+def test_new_collection_names_are_unique(monkeypatch):
+    db = VectorDatabase.__new__(VectorDatabase)
+    db.collection_name = "rag_docs"
+    monkeypatch.setattr(database.utility, "has_collection", lambda name: False)
+    names = {db._new_collection_name() for _ in range(50)}
+    assert len(names) == 50
+    assert all(name.startswith("rag_docs_") for name in names)
+
+    monkeypatch.setattr(database.utility, "has_collection", lambda name: True)
+    with pytest.raises(RuntimeError, match="already exists"):
+        db._new_collection_name()
@@ -0,0 +1,108 @@
+from io import BytesIO
+import zipfile
+import pytest
+from backend import document_processor
+from backend.document_processor import (
+    extract_document, sniff_format, DocumentTooLargeError, UnsupportedFormatError,
+)
+
+def sniff(data: bytes, filename: str = "") -> str:
+    return sniff_format(BytesIO(data), filename)
+
+def make_zip(files) -> bytes:
+    stream = BytesIO()
+    with zipfile.ZipFile(stream, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return stream.getvalue()
+
+@pytest.mark.parametrize("head, expected", [
+    (b"%PDF-1.7\n", "pdf"),
+    (b"II*\x00\x08\x00\x00\x00", "tiff"),
+    (b"MM\x00*\x00\x00\x00\x08", "tiff"),
+    (b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR", "image"),
+    (b"\xff\xd8\xff\xe0\x00\x10JFIF", "image"),
+    (b"GIF87a\x01\x00\x01\x00", "image"),
+    (b"GIF89a\x01\x00\x01\x00", "image"),
+    (b"RIFF\x24\x00\x00\x00WEBPVP8 ", "image"),
+    (b"BM" + b"\x00" * 12 + (40).to_bytes(4, "little"), "image"),
+])
+def test_magic_numbers(head, expected):
+    # The extension is ignored when the content is recognised
+    assert sniff(head + b"\x00" * 32, "misnamed.txt") == expected
+
+def test_bm_text_is_not_bmp():
+    assert sniff(b"BMW owners manual\n", "notes.txt") == "text"
+
+def test_docx():
+    data = make_zip({"word/document.xml": "<w:document/>"})
+    assert sniff(data, "report.bin") == "docx"
+
+def test_other_zip_is_unsupported():
+    with pytest.raises(UnsupportedFormatError):
+        sniff(make_zip({"data.csv": "a,b"}), "data.zip")
+
+def test_corrupt_zip_is_unsupported():
+    with pytest.raises(UnsupportedFormatError):
+        sniff(b"PK\x03\x04" + b"\x00" * 64, "broken.docx")
+
+@pytest.mark.parametrize("data, filename, expected", [
+    (b"<!DOCTYPE html><html><body>Hi</body></html>", "page", "html"),
+    (b"\n  <html><p>Hi</p></html>", "", "html"),
+    (b"<div>frag</div>", "frag.html", "html"),
+    (b"just words", "page.htm", "html"),
+    (b"Intro\n<p>A paragraph</p>", "snippet", "html"),
+    (b"# Title\n\n<div>inline html</div>", "README.md", "markdown"),
+    (b"# Title\n\nSome *markdown*", "notes.markdown", "markdown"),
+    (b"# Title\n\nSome *markdown*", "notes.txt", "text"),
+    (b"a < b and b > c", "", "text"),
+    ("café crème".encode("latin-1"), "menu.txt", "text"),
+])
+def test_text_formats(data, filename, expected):
+    assert sniff(data, filename) == expected
+
+@pytest.mark.parametrize("encoding", ["utf-16", "utf-16-be", "utf-32", "utf-8-sig"])
+def test_text_with_byte_order_mark(encoding):
+    text = "Unicode text üß中"
+    data = text.encode(encoding)
+    if encoding == "utf-16-be":
+        data = b"\xfe\xff" + data
+
+    assert extract_document(BytesIO(data), "notes.txt") == ("text", text)
+
+def test_utf16_html_fragment():
+    data = "<p>Hello</p>".encode("utf-16")
+    assert sniff(data, "upload") == "html"
+
+@pytest.mark.parametrize("data", [b"", b"\x00\x01\x02binary\x03", b"\x7fELF\x02\x01\x01\x00"])
+def test_unrecognised_content_is_rejected(data):
+    with pytest.raises(UnsupportedFormatError):
+        sniff(data, "file.txt")
+
+def test_sniff_rewinds_stream():
+    stream = BytesIO(make_zip({"word/document.xml": "<w:document/>"}))
+    sniff_format(stream, "report.docx")
+    assert stream.tell() == 0
+
+def test_extract_docx_and_html():
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    document = (
+        f'<w:document xmlns:w="{ns}"><w:body>'
+        "<w:p><w:r><w:t>First</w:t><w:tab/><w:t>line</w:t></w:r></w:p>"
+        "<w:p><w:r><w:t>Second</w:t></w:r></w:p>"
+        "</w:body></w:document>"
+    )
+    docx = make_zip({"word/document.xml": document})
+    assert extract_document(BytesIO(docx), "a.docx") == ("docx", "First\tline\nSecond")
+
+    html = b"<html><script>x()</script><body><nav>Menu</nav><p>Body text</p></body></html>"
+    assert extract_document(BytesIO(html), "a.html") == ("html", "Body text")
+
+def test_docx_expanding_past_the_limit_is_rejected(monkeypatch):
+    monkeypatch.setattr(document_processor, "MAX_DOCX_XML_SIZE", 1024)
+    docx = BytesIO()
+    with zipfile.ZipFile(docx, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("word/document.xml", "<w:document>" + " " * 4096 + "</w:document>")
+
+    with pytest.raises(DocumentTooLargeError):
+        extract_document(BytesIO(docx.getvalue()), "bomb.docx")
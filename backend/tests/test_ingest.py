@@ -0,0 +1,98 @@
+import json
+import os
+from backend import ingest
+from backend.ingest import Ingester, load_checkpoint
+
+def write_checkpoint(path, entries, tail: str = "") -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+        f.write(tail)
+
+def test_missing_checkpoint_is_empty(tmp_path):
+    assert load_checkpoint(str(tmp_path / "absent.jsonl")) == (set(), {}, set())
+
+def test_started_items_are_interrupted_until_done(tmp_path):
+    path = tmp_path / "ckpt.jsonl"
+    write_checkpoint(path, [
+        {"item": "a.pdf", "source": "pdf:a.pdf", "status": "started"},
+        {"item": "b.txt", "source": "text:b.txt", "status": "started"},
+        {"item": "a.pdf", "status": "done", "chunks": 3},
+        {"item": "c.md", "source": "markdown:c.md", "status": "started"},
+    ])
+
+    done, interrupted, _ = load_checkpoint(str(path))
+    assert done == {"a.pdf"}
+    assert interrupted == {"b.txt": "text:b.txt", "c.md": "markdown:c.md"}
+
+def test_restarted_done_item_stays_done(tmp_path):
+    path = tmp_path / "ckpt.jsonl"
+    write_checkpoint(path, [
+        {"item": "a.pdf", "source": "pdf:a.pdf", "status": "started"},
+        {"item": "a.pdf", "status": "done", "chunks": 3},
+        {"item": "a.pdf", "source": "pdf:a.pdf", "status": "started"},
+    ])
+
+    assert load_checkpoint(str(path)) == ({"a.pdf"}, {}, set())
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = tmp_path / "ckpt.jsonl"
+    write_checkpoint(
+        path,
+        [{"item": "a.pdf", "source": "pdf:a.pdf", "status": "started"}],
+        tail='{"item": "a.pdf", "sta',
+    )
+
+    assert load_checkpoint(str(path)) == (set(), {"a.pdf": "pdf:a.pdf"}, set())
+
+def test_started_entry_without_source(tmp_path):
+    path = tmp_path / "ckpt.jsonl"
+    write_checkpoint(path, [{"item": "old.txt", "status": "started"}])
+
+    assert load_checkpoint(str(path)) == (set(), {"old.txt": None}, set())
+
+def test_only_unfinished_staging_collections_are_returned(tmp_path):
+    path = tmp_path / "ckpt.jsonl"
+    write_checkpoint(path, [
+        {"staging": "rag_docs_1", "status": "staging"},
+        {"item": "a.pdf", "source": "pdf:a.pdf", "status": "started"},
+        {"staging": "rag_docs_1", "status": "swapped"},
+        {"staging": "rag_docs_2", "status": "staging"},
+        {"staging": "rag_docs_3", "status": "staging"},
+        {"staging": "rag_docs_3", "status": "dropped"},
+    ])
+
+    assert load_checkpoint(str(path)) == (set(), {"a.pdf": "pdf:a.pdf"}, {"rag_docs_2"})
+
+def crashing_extract(item: str):
+    """Stand-in for extract_item that kills its worker process on one item"""
+    if item == "crash":
+        os._exit(1)
+    return item, f"text:{item}", f"content of {item}", None
+
+class RecordingDatabase:
+    def __init__(self):
+        self.sources = []
+
+    def process_contents(self, documents):
+        self.sources.extend(source for _, source in documents)
+        return [1 for _ in documents]
+
+def test_worker_crash_fails_only_the_culprit(tmp_path, monkeypatch):
+    # Workers are spawned and import this module to find the function
+    monkeypatch.setattr(ingest, "extract_item", crashing_extract)
+    db = RecordingDatabase()
+    ingester = Ingester(db, str(tmp_path / "ckpt.jsonl"), str(tmp_path / "failures.jsonl"),
+                        workers=2, batch_size=2)
+    items = ["a", "b", "crash", "c", "d", "e"]
+    try:
+        ingester.run(items)
+    finally:
+        ingester.close()
+
+    assert sorted(db.sources) == [f"text:{item}" for item in items if item != "crash"]
+    with open(tmp_path / "failures.jsonl", encoding="utf-8") as f:
+        failures = [json.loads(line) for line in f]
+    assert [failure["item"] for failure in failures] == ["crash"]
+    assert "worker died" in failures[0]["error"]
+    assert ingester.failed == 1
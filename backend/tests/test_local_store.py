@@ -0,0 +1,77 @@
+from typing import List
+from langchain_core.embeddings import Embeddings
+from backend.local_store import LocalVectorStore
+
+class KeywordEmbeddings(Embeddings):
+    """Embeds text as counts of a few keywords, so nearest neighbours are predictable"""
+
+    KEYWORDS = ["milvus", "python", "tiff", "upload"]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        words = text.lower().split()
+        return [float(words.count(keyword)) for keyword in self.KEYWORDS]
+
+def make_store(tmp_path) -> LocalVectorStore:
+    return LocalVectorStore(KeywordEmbeddings(), str(tmp_path / "vectors.jsonl"))
+
+def test_add_and_search_round_trip(tmp_path):
+    store = make_store(tmp_path)
+    ids = store.add_texts(
+        ["milvus milvus", "python python", "tiff tiff"],
+        [{"source": "a"}, {"source": "b"}, {"source": "c"}],
+    )
+
+    assert len(set(ids)) == 3
+    assert store.count() == 3
+    [doc] = store.similarity_search("python", k=1)
+    assert doc.page_content == "python python"
+    assert doc.metadata == {"source": "b"}
+
+def test_delete_where_removes_only_matching_records(tmp_path):
+    store = make_store(tmp_path)
+    store.add_texts(["milvus", "python", "tiff"], [{"source": "a"}, {"source": "b"}, {"source": "a"}])
+
+    assert store.delete_where("source", "a") == 2
+    assert store.delete_where("source", "missing") == 0
+    assert store.count() == 1
+    assert [d.metadata["source"] for d in store.similarity_search("milvus", k=4)] == ["b"]
+
+def test_reload_sees_writes_and_deletes(tmp_path):
+    store = make_store(tmp_path)
+    store.add_texts(["milvus", "python"], [{"source": "a"}, {"source": "b"}])
+    store.delete_where("source", "a")
+    store.add_texts(["upload"], [{"source": "c"}])
+
+    reloaded = make_store(tmp_path)
+    assert reloaded.count() == 2
+    assert {d.metadata["source"] for d in reloaded.similarity_search("upload", k=4)} == {"b", "c"}
+
+def test_instances_sharing_a_file_see_each_other(tmp_path):
+    first = make_store(tmp_path)
+    second = make_store(tmp_path)
+
+    first.add_texts(["milvus"], [{"source": "a"}])
+    second.add_texts(["python"], [{"source": "b"}])
+    assert first.count() == 2
+    assert second.count() == 2
+
+    # A rewrite by one instance must keep records the other appended
+    first.delete_where("source", "a")
+    second.add_texts(["tiff"], [{"source": "c"}])
+    assert first.count() == 2
+    assert {d.metadata["source"] for d in first.similarity_search("tiff", k=4)} == {"b", "c"}
+
+def test_torn_record_is_skipped_and_terminated(tmp_path):
+    store = make_store(tmp_path)
+    store.add_texts(["milvus"], [{"source": "a"}])
+    with open(store.path, "ab") as f:
+        f.write(b'{"id": "torn", "text": "pyth')
+
+    reloaded = make_store(tmp_path)
+    assert reloaded.count() == 1
+
+    reloaded.add_texts(["python"], [{"source": "b"}])
+    assert make_store(tmp_path).count() == 2
@@ -33,7 +33,7 @@ def main():
                     else:
                         st.error(f"Error: {response.text}")
         else:
-            file = st.file_uploader("Upload document", type=["pdf", "png", "jpg", "jpeg"])
+            file = st.file_uploader("Upload document", type=["pdf", "png", "jpg", "jpeg", "gif", "bmp", "webp", "tif", "tiff", "docx", "html", "htm", "txt", "md"])
             if st.button("Upload File") and file:
                 with st.spinner("Processing file..."):
                     files = {"file": (file.name, file.getvalue())}